@@ -1,11 +1,13 @@
 """Utility helpers to download Bitcoin prices from Yahoo Finance."""
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Sequence
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
@@ -14,6 +16,35 @@ from .storage import DEFAULT_DB_PATH, save_bitcoin_prices
 
 Interval = Literal["1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"]
 
+DEFAULT_CACHE_DIR = Path("data/yf_cache")
+
+# Yahoo quantizes 1-minute candles, so within a minute bucket the response
+# is effectively unchanged; repeated CLI invocations inside the TTL reuse
+# the cached frame instead of refetching ~10k rows over HTTPS.
+_DOWNLOAD_CACHE_TTL_SECONDS = 60
+
+
+def _download_cache_path(symbols: Sequence[str], period: str, interval: str) -> Path:
+    key = "_".join((*symbols, period, interval)).replace("/", "-")
+    return DEFAULT_CACHE_DIR / f"{key}.pkl"
+
+
+def _load_cached_download(cache_path: Path) -> pd.DataFrame | None:
+    if not cache_path.exists():
+        return None
+    if time.time() - cache_path.stat().st_mtime > _DOWNLOAD_CACHE_TTL_SECONDS:
+        return None
+    try:
+        return pd.read_pickle(cache_path)
+    except Exception:
+        # A corrupt or unreadable cache entry is never fatal; refetch.
+        return None
+
+
+def _store_cached_download(cache_path: Path, frame: pd.DataFrame) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_pickle(cache_path)
+
 
 @dataclass
 class PriceData:
@@ -29,6 +60,7 @@ def download_bitcoin_prices(
     interval: Interval = "1m",
     start_date: datetime = datetime.now(tz=timezone.utc),
     db_path: Path | str = DEFAULT_DB_PATH,
+    symbols: Sequence[str] = ("BTC-USD",),
 ) -> PriceData:
     """Download recent Bitcoin candles and compute the change index.
 
@@ -40,6 +72,11 @@ def download_bitcoin_prices(
         perfect for the requested fingerprint windows.
     interval: Interval
         Candle interval supported by Yahoo Finance.
+    symbols: Sequence[str]
+        Tickers to fetch in a single batched Yahoo Finance request. The
+        first symbol is the one the pipeline processes, so ``BTC-USD``
+        must stay in front; companions ride along in the same request
+        instead of costing an extra round-trip each.
 
     Returns
     -------
@@ -48,8 +85,26 @@ def download_bitcoin_prices(
         with the price deltas for each timestamp.
     """
 
-    ticker = yf.Ticker("BTC-USD")
-    df = ticker.history(period=period, interval=interval)
+    cache_path = _download_cache_path(symbols, period, interval)
+    raw = _load_cached_download(cache_path)
+    if raw is None:
+        raw = yf.download(
+            tickers=" ".join(symbols),
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+        if raw is not None and not raw.empty:
+            _store_cached_download(cache_path, raw)
+    if raw is None or raw.empty:
+        raise RuntimeError(
+            "Yahoo Finance returned no data for BTC-USD. Try a different period or interval."
+        )
+
+    df = raw[symbols[0]] if isinstance(raw.columns, pd.MultiIndex) else raw
+    df = df.dropna(subset=["Close"])
     if df.empty:
         raise RuntimeError(
             "Yahoo Finance returned no data for BTC-USD. Try a different period or interval."
@@ -63,16 +118,26 @@ def download_bitcoin_prices(
         start_ts = start_ts.tz_localize("UTC")
     else:
         start_ts = start_ts.tz_convert("UTC")
-    df = df[df["timestamp"] >= start_ts]
+    # Timestamps arrive sorted from Yahoo, so a binary search replaces the
+    # O(N) boolean mask (and its full-length allocation).
+    first_row = df["timestamp"].searchsorted(start_ts, side="left")
+    df = df.iloc[first_row:]
     if df.empty:
         raise RuntimeError(
             "No Bitcoin candles were available on or after the requested start_date."
         )
 
-    # Index all changes in the close price.
-    df["price_change"] = df["Close"].diff().fillna(0.0)
-
-    change_index = df[["timestamp", "price_change"]].copy()
+    # Index all changes in the close price: one allocation, one
+    # subtraction pass, and no NaN seeding to clean up afterwards.
+    close = df["Close"].to_numpy()
+    price_change = np.empty_like(close)
+    price_change[0] = 0.0
+    np.subtract(close[1:], close[:-1], out=price_change[1:])
+    df["price_change"] = price_change
+
+    # Column selection already yields a new frame that shares the
+    # underlying arrays; a deep copy here would just double the data.
+    change_index = df[["timestamp", "price_change"]]
 
     save_bitcoin_prices(df, db_path=db_path)
 
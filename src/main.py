@@ -2,19 +2,19 @@
 from __future__ import annotations
 
 import argparse
-import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Sequence
 
+import orjson
 import pandas as pd
 
 from .data_fetcher import download_bitcoin_prices
-from .fingerprint import FingerprintGenerator, WINDOWS_MINUTES, fingerprints_to_dataframe
+from .fingerprint import FingerprintGenerator, WINDOWS_MINUTES
 from .storage import DEFAULT_DB_PATH
 
 
-WINDOW_ORDER: Sequence[str] = list(WINDOWS_MINUTES.keys())
+WINDOW_ORDER: Sequence[str] = sorted(WINDOWS_MINUTES, key=WINDOWS_MINUTES.get)
 
 
 def parse_args() -> argparse.Namespace:
@@ -64,8 +64,7 @@ def main() -> None:
     )
 
     generator = FingerprintGenerator(price_data.candles)
-    fingerprints = generator.generate(WINDOW_ORDER)
-    fingerprint_df = fingerprints_to_dataframe(fingerprints)
+    fingerprint_df = generator.generate_frame(WINDOW_ORDER)
 
     _print_preview(fingerprint_df)
     _save_output(args.output, fingerprint_df, price_data.change_index)
@@ -83,7 +82,13 @@ def _save_output(output_path: Path, fp_df: pd.DataFrame, change_df: pd.DataFrame
         "fingerprints": fp_df.to_dict(orient="records"),
         "price_changes": change_df.to_dict(orient="records"),
     }
-    output_path.write_text(json.dumps(payload, indent=2, default=str))
+    output_path.write_bytes(
+        orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+        )
+    )
     print(f"Saved {len(fp_df)} fingerprints to {output_path}")
 
 
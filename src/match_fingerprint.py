@@ -56,7 +56,7 @@ def main() -> None:
     )
 
     catalog = _load_catalog(args.fingerprints)
-    match = _find_matching_fingerprint(catalog["fingerprints"], latest_fp["fingerprint_id"])
+    match = catalog["fingerprints_by_id"].get(latest_fp["fingerprint_id"])
 
     if match:
         print(
@@ -66,6 +66,7 @@ def main() -> None:
         )
     else:
         catalog["fingerprints"].append(latest_fp)
+        catalog["fingerprints_by_id"][latest_fp["fingerprint_id"]] = latest_fp
         _save_catalog(args.fingerprints, catalog)
         print(
             "Added new fingerprint for window {window}: {fingerprint_id}".format(
@@ -87,13 +88,12 @@ def _generate_latest_fingerprint(
     )
 
     generator = FingerprintGenerator(price_data.candles)
-    fingerprints = generator.generate([window])
-    if not fingerprints:
+    latest = generator.generate_last(window)
+    if latest is None:
         raise RuntimeError(
             f"Unable to generate fingerprints for window '{window}'. Not enough candles were returned."
         )
 
-    latest = fingerprints[-1]
     return _fingerprint_to_dict(latest)
 
 
@@ -113,32 +113,32 @@ def _fingerprint_to_dict(fp: Fingerprint) -> Dict[str, Any]:
     }
 
 
-def _load_catalog(path: Path) -> Dict[str, List[Dict[str, Any]]]:
+def _load_catalog(path: Path) -> Dict[str, Any]:
     if not path.exists():
-        return {"fingerprints": [], "price_changes": []}
+        fingerprints: List[Dict[str, Any]] = []
+        price_changes: List[Dict[str, Any]] = []
+    else:
+        try:
+            data = json.loads(path.read_text())
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(f"Unable to parse fingerprint catalog at {path}") from exc
 
-    try:
-        data = json.loads(path.read_text())
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Unable to parse fingerprint catalog at {path}") from exc
+        fingerprints = data.get("fingerprints") or []
+        price_changes = data.get("price_changes") or []
 
-    fingerprints = data.get("fingerprints") or []
-    price_changes = data.get("price_changes") or []
-    return {"fingerprints": fingerprints, "price_changes": price_changes}
+    return {
+        "fingerprints": fingerprints,
+        "price_changes": price_changes,
+        # Derived index for O(1) matching; rebuilt on load and never
+        # serialized back to disk.
+        "fingerprints_by_id": {fp["fingerprint_id"]: fp for fp in fingerprints},
+    }
 
 
-def _save_catalog(path: Path, catalog: Dict[str, List[Dict[str, Any]]]) -> None:
+def _save_catalog(path: Path, catalog: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(catalog, indent=2))
-
-
-def _find_matching_fingerprint(
-    fingerprints: List[Dict[str, Any]], fingerprint_id: str
-) -> Dict[str, Any] | None:
-    for fp in fingerprints:
-        if fp.get("fingerprint_id") == fingerprint_id:
-            return fp
-    return None
+    payload = {key: value for key, value in catalog.items() if key != "fingerprints_by_id"}
+    path.write_text(json.dumps(payload, indent=2))
 
 
 if __name__ == "__main__":